@@ -1,3 +1,5 @@
+from typing import List, Optional
+
 from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
@@ -9,7 +11,59 @@ class Settings(BaseSettings):
     RAZORPAY_WEBHOOK_SECRET: str
     PLATFORM_BOT_TOKEN: str
 
+    # Mongo connection pool
+    MONGO_MAX_POOL_SIZE: int = 100
+    MONGO_MIN_POOL_SIZE: int = 0
+    MONGO_MAX_IDLE_TIME_MS: Optional[int] = None
+    MONGO_WAIT_QUEUE_TIMEOUT_MS: Optional[int] = None
+    MONGO_WRITE_CONCERN: str = "1"
+
+    # Primary handle (payments, subscriptions, writes)
+    PRIMARY_READ_CONCERN: str = "local"
+
+    # Analytics handle (dashboards, stats aggregations)
+    ANALYTICS_READ_PREFERENCE: str = "secondaryPreferred"
+    ANALYTICS_READ_CONCERN: str = "local"
+    ANALYTICS_MAX_STALENESS_SECONDS: int = -1
+
+    # Creator broadcasts
+    BROADCAST_RATE_PER_SECOND: float = 25.0
+    BROADCAST_CONCURRENCY: int = 20
+    BROADCAST_PAGE_SIZE: int = 500
+    BROADCAST_STALE_SECONDS: int = 300
+
+    # Renewal reminders, sent once per window before expiry
+    REMINDER_WINDOWS_DAYS: List[int] = [7, 3, 1]
+    REMINDER_INTERVAL_MINUTES: int = 60
+    REMINDER_BATCH_SIZE: int = 500
+
+    # Telegram update webhook and join-request gate
+    TELEGRAM_WEBHOOK_SECRET: Optional[str] = None
+    ENTITLEMENT_REFRESH_MINUTES: int = 30
+
+    # Removing expired users from groups
+    KICK_BAN_SECONDS: int = 60
+    KICK_PER_CHAT_RATE: float = 5.0
+    KICK_PER_CHAT_BURST: int = 5
+    KICK_CONCURRENCY: int = 20
+    REVOKE_MAX_ATTEMPTS: int = 5
+
+    # Outbound Bot API connections; covers broadcast + kick concurrency
+    TELEGRAM_CONNECTION_POOL_SIZE: int = 64
+
+    # Request tracing
+    TRACE_SAMPLE_RATE: float = 1.0
+    TRACE_SLOW_MS: float = 500.0
+    TRACE_BUFFER_SIZE: int = 100
+
+    # Buffered event log
+    EVENT_LOG_QUEUE_SIZE: int = 10000
+    EVENT_LOG_BATCH_SIZE: int = 500
+    EVENT_LOG_FLUSH_SECONDS: float = 1.0
+    EVENT_LOG_MAX_WAIT_MS: int = 50
+    EVENT_LOG_CAPPED_BYTES: int = 512 * 1024 * 1024
+
     class Config:
         env_file = ".env"
 
-settings = Settings()
\ No newline at end of file
+settings = Settings()
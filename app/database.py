@@ -1,5 +1,77 @@
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo.read_concern import ReadConcern
+from pymongo.read_preferences import (
+    Nearest,
+    Primary,
+    PrimaryPreferred,
+    Secondary,
+    SecondaryPreferred,
+)
+from pymongo.write_concern import WriteConcern
+
 from app.config import settings
+from app.utils.tracing import MongoCommandTracer
+
+
+READ_PREFERENCES = {
+    "primary": Primary,
+    "primaryPreferred": PrimaryPreferred,
+    "secondary": Secondary,
+    "secondaryPreferred": SecondaryPreferred,
+    "nearest": Nearest,
+}
+
+
+def build_read_preference(name: str, max_staleness: int = -1):
+
+    if name not in READ_PREFERENCES:
+        raise ValueError(f"Unknown read preference: {name}")
+
+    # Primary reads can't be stale, so it takes no staleness bound
+    if name == "primary":
+        return Primary()
+
+    return READ_PREFERENCES[name](max_staleness=max_staleness)
+
+
+def build_write_concern(w: str):
+
+    return WriteConcern(w=int(w) if w.isdigit() else w)
+
+
+pool_options = {
+    "maxPoolSize": settings.MONGO_MAX_POOL_SIZE,
+    "minPoolSize": settings.MONGO_MIN_POOL_SIZE,
+}
+
+if settings.MONGO_MAX_IDLE_TIME_MS is not None:
+    pool_options["maxIdleTimeMS"] = settings.MONGO_MAX_IDLE_TIME_MS
+
+if settings.MONGO_WAIT_QUEUE_TIMEOUT_MS is not None:
+    pool_options["waitQueueTimeoutMS"] = settings.MONGO_WAIT_QUEUE_TIMEOUT_MS
+
+client = AsyncIOMotorClient(
+    settings.MONGO_URI,
+    event_listeners=[MongoCommandTracer()],
+    **pool_options
+)
+
+# Payments, subscriptions and everything that writes
+db_primary = client.get_database(
+    settings.DATABASE_NAME,
+    read_preference=Primary(),
+    read_concern=ReadConcern(settings.PRIMARY_READ_CONCERN),
+    write_concern=build_write_concern(settings.MONGO_WRITE_CONCERN)
+)
+
+# Dashboards and stats aggregations; may be served by secondaries
+db_analytics = client.get_database(
+    settings.DATABASE_NAME,
+    read_preference=build_read_preference(
+        settings.ANALYTICS_READ_PREFERENCE,
+        settings.ANALYTICS_MAX_STALENESS_SECONDS
+    ),
+    read_concern=ReadConcern(settings.ANALYTICS_READ_CONCERN)
+)
 
-client = AsyncIOMotorClient(settings.MONGO_URI)
-db = client[settings.DATABASE_NAME]
\ No newline at end of file
+db = db_primary
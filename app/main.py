@@ -1,12 +1,21 @@
-from fastapi import FastAPI
+import time
+
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 
 from app.database import db
+from app.config import settings
 from app.routes import group
 from app.routes import health, creator, plan, payment, user, subscription
+from app.routes import bulk, broadcast, telegram, debug, events
 from app.services.subscription_cleanup import remove_expired_subscriptions
 from app.scheduler.renewal_reminder import send_renewal_reminders
+from app.services.broadcast_service import resume_stalled_broadcasts
+from app.services.entitlement_index import load_access_indexes
+from app.services.event_log import event_log, setup_event_log
+from app.services.telegram_bot import start_bot, stop_bot
+from app.utils.tracing import start_trace, finish_request
 
 app = FastAPI(title="Telegram Subscription Platform")
 
@@ -18,6 +27,28 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+
+@app.middleware("http")
+async def trace_requests(request: Request, call_next):
+
+    trace = start_trace()
+    started = time.perf_counter()
+    status = 500
+
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        route = request.scope.get("route")
+        finish_request(
+            trace,
+            request.method,
+            route.path if route else request.url.path,
+            status,
+            (time.perf_counter() - started) * 1000
+        )
+
 app.include_router(health.router)
 app.include_router(creator.router)
 app.include_router(plan.router)
@@ -25,6 +56,11 @@ app.include_router(payment.router)
 app.include_router(user.router)
 app.include_router(subscription.router)
 app.include_router(group.router)
+app.include_router(bulk.router)
+app.include_router(broadcast.router)
+app.include_router(telegram.router)
+app.include_router(debug.router)
+app.include_router(events.router)
 
 scheduler = AsyncIOScheduler()
 
@@ -38,14 +74,43 @@ async def startup_event():
 
     await db.creators.create_index("telegram_id")
     await db.creators.create_index("creator_code")
+    await db.creators.create_index("group_ids")
+
+    await db.groups.create_index("group_id")
 
     await db.orders.create_index("razorpay_payment_link_id")
 
     await db.subscriptions.create_index("user_id")
     await db.subscriptions.create_index("creator_id")
+    await db.subscriptions.create_index("plan_id")
     await db.subscriptions.create_index("end_date")
+    await db.subscriptions.create_index([
+        ("creator_id", 1),
+        ("user_id", 1),
+        ("end_date", 1)
+    ])
+
+    await db.subscriptions.create_index([
+        ("is_active", 1),
+        ("end_date", 1),
+        ("reminder_window", 1)
+    ])
+    await db.subscriptions.create_index(
+        [("is_active", 1), ("invite_lease_until", 1)],
+        partialFilterExpression={"invite_sent": False}
+    )
+    await db.subscriptions.create_index("invite_lease_token", sparse=True)
+
+    await db.broadcasts.create_index("status")
 
     await db.plans.create_index("creator_id")
+    await db.plans.create_index("group_id")
+
+    await load_access_indexes()
+
+    await setup_event_log()
+
+    await start_bot()
 
     scheduler.add_job(
         remove_expired_subscriptions,
@@ -56,7 +121,19 @@ async def startup_event():
     scheduler.add_job(
         send_renewal_reminders,
         trigger="interval",
-        hours=6
+        minutes=settings.REMINDER_INTERVAL_MINUTES
+    )
+
+    scheduler.add_job(
+        resume_stalled_broadcasts,
+        trigger="interval",
+        minutes=1
+    )
+
+    scheduler.add_job(
+        load_access_indexes,
+        trigger="interval",
+        minutes=settings.ENTITLEMENT_REFRESH_MINUTES
     )
 
     scheduler.start()
@@ -64,4 +141,6 @@ async def startup_event():
 
 @app.on_event("shutdown")
 async def shutdown_event():
-    scheduler.shutdown()
\ No newline at end of file
+    scheduler.shutdown()
+    await event_log.stop()
+    await stop_bot()
\ No newline at end of file
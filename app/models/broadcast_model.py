@@ -0,0 +1,7 @@
+from pydantic import BaseModel
+from typing import Optional
+
+
+class BroadcastCreate(BaseModel):
+    text: str
+    parse_mode: Optional[str] = None
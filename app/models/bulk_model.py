@@ -0,0 +1,16 @@
+from pydantic import BaseModel
+from typing import Optional, List
+from datetime import datetime
+
+
+class BulkFilter(BaseModel):
+    creator_id: Optional[str] = None
+    plan_ids: List[str] = []
+    # Plans: created in range. Subscriptions: active at any point in range.
+    from_date: Optional[datetime] = None
+    to_date: Optional[datetime] = None
+    chunk_size: int = 1000
+
+
+class BulkExtend(BulkFilter):
+    days: int
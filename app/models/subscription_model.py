@@ -0,0 +1,14 @@
+from pydantic import BaseModel
+from typing import List
+
+
+class InviteClaim(BaseModel):
+    worker_id: str
+    limit: int = 50
+    lease_seconds: int = 60
+
+
+class InviteAck(BaseModel):
+    lease_token: str
+    sent_ids: List[str] = []
+    failed_ids: List[str] = []
@@ -0,0 +1,116 @@
+from fastapi import APIRouter, HTTPException
+from datetime import datetime
+
+from app.database import db
+from app.models.broadcast_model import BroadcastCreate
+from app.routes.plan import validate_object_id
+from app.services.broadcast_service import start_broadcast
+
+router = APIRouter()
+
+
+def broadcast_response(broadcast):
+
+    return {
+        "id": str(broadcast["_id"]),
+        "creator_id": str(broadcast["creator_id"]),
+        "status": broadcast["status"],
+        "sent": broadcast.get("sent", 0),
+        "blocked": broadcast.get("blocked", 0),
+        "failed": broadcast.get("failed", 0),
+        "last_user_id": broadcast.get("last_user_id"),
+        "created_at": broadcast["created_at"],
+        "finished_at": broadcast.get("finished_at"),
+        "error": broadcast.get("error")
+    }
+
+
+# =========================================================
+# CREATE BROADCAST
+# =========================================================
+@router.post("/creator/{creator_id}/broadcast")
+async def create_broadcast(creator_id: str, data: BroadcastCreate):
+
+    creator_object_id = validate_object_id(creator_id)
+
+    creator = await db.creators.find_one({
+        "_id": creator_object_id,
+        "is_active": True
+    })
+
+    if not creator:
+        raise HTTPException(status_code=404, detail="Creator not found")
+
+    if not data.text.strip():
+        raise HTTPException(status_code=400, detail="Message is empty")
+
+    broadcast = {
+        "creator_id": creator_object_id,
+        "text": data.text,
+        "parse_mode": data.parse_mode,
+        "status": "queued",
+        "sent": 0,
+        "blocked": 0,
+        "failed": 0,
+        "last_user_id": None,
+        "created_at": datetime.utcnow(),
+        "finished_at": None,
+        "error": None
+    }
+
+    result = await db.broadcasts.insert_one(broadcast)
+    broadcast["_id"] = result.inserted_id
+
+    await start_broadcast(result.inserted_id)
+
+    broadcast["status"] = "running"
+
+    return broadcast_response(broadcast)
+
+
+# =========================================================
+# BROADCAST PROGRESS
+# =========================================================
+@router.get("/broadcast/{broadcast_id}")
+async def get_broadcast(broadcast_id: str):
+
+    broadcast = await db.broadcasts.find_one({
+        "_id": validate_object_id(broadcast_id)
+    })
+
+    if not broadcast:
+        raise HTTPException(status_code=404, detail="Broadcast not found")
+
+    return broadcast_response(broadcast)
+
+
+# =========================================================
+# RESUME BROADCAST
+# =========================================================
+@router.post("/broadcast/{broadcast_id}/resume")
+async def resume_broadcast(broadcast_id: str):
+
+    if not await start_broadcast(validate_object_id(broadcast_id)):
+        raise HTTPException(status_code=409, detail="Broadcast is not resumable")
+
+    return {"message": "Broadcast resumed"}
+
+
+# =========================================================
+# CANCEL BROADCAST
+# =========================================================
+@router.post("/broadcast/{broadcast_id}/cancel")
+async def cancel_broadcast(broadcast_id: str):
+
+    result = await db.broadcasts.update_one(
+        {
+            "_id": validate_object_id(broadcast_id),
+            "status": {"$in": ["queued", "running", "failed"]}
+        },
+        {"$set": {"status": "cancelled", "finished_at": datetime.utcnow()}}
+    )
+
+    if result.matched_count == 0:
+        raise HTTPException(status_code=409, detail="Broadcast is not running")
+
+    return {"message": "Broadcast cancelled"}
@@ -0,0 +1,215 @@
+from fastapi import APIRouter, HTTPException
+from datetime import datetime
+
+from app.database import db
+from app.models.bulk_model import BulkFilter, BulkExtend
+from app.routes.plan import validate_object_id
+from app.services.bulk_service import start_bulk_job
+from app.services.entitlement_index import entitlements
+
+router = APIRouter()
+
+MAX_CHUNK_SIZE = 5000
+
+
+# =========================================================
+# HELPERS: Build filters
+# =========================================================
+def check_filter(data: BulkFilter):
+
+    if not (data.creator_id or data.plan_ids or data.from_date or data.to_date):
+        raise HTTPException(status_code=400, detail="At least one filter is required")
+
+    if not 0 < data.chunk_size <= MAX_CHUNK_SIZE:
+        raise HTTPException(status_code=400, detail="Invalid chunk size")
+
+
+async def plan_query(data: BulkFilter):
+
+    check_filter(data)
+
+    query = {}
+
+    if data.creator_id:
+
+        creator_object_id = validate_object_id(data.creator_id)
+
+        # create_plan only stores the plan's group, so match through groups too
+        group_object_ids = [
+            group["_id"]
+            async for group in db.groups.find(
+                {"creator_id": creator_object_id},
+                {"_id": 1}
+            )
+        ]
+
+        query["$or"] = [
+            {"creator_id": creator_object_id},
+            {"group_id": {"$in": group_object_ids}}
+        ]
+
+    if data.plan_ids:
+        query["_id"] = {"$in": [validate_object_id(p) for p in data.plan_ids]}
+
+    created_at = {}
+
+    if data.from_date:
+        created_at["$gte"] = data.from_date
+
+    if data.to_date:
+        created_at["$lte"] = data.to_date
+
+    if created_at:
+        query["created_at"] = created_at
+
+    return query
+
+
+def subscription_query(data: BulkFilter):
+
+    check_filter(data)
+
+    # Revoked subs wait for the cleanup kick with is_active still set;
+    # extending one would silently undo the revoke
+    query = {"is_active": True, "status": {"$ne": "revoked"}}
+
+    if data.creator_id:
+        query["creator_id"] = validate_object_id(data.creator_id)
+
+    if data.plan_ids:
+        query["plan_id"] = {"$in": [validate_object_id(p) for p in data.plan_ids]}
+
+    # Active at any point in [from_date, to_date]
+    if data.from_date:
+        query["end_date"] = {"$gte": data.from_date}
+
+    if data.to_date:
+        query["start_date"] = {"$lte": data.to_date}
+
+    return query
+
+
+def job_response(job):
+
+    return {
+        "job_id": str(job["_id"]),
+        "kind": job["kind"],
+        "status": job["status"],
+        "total": job["total"],
+        "matched": job["matched"],
+        "modified": job["modified"],
+        "chunks": job["chunks"],
+        "created_at": job["created_at"],
+        "finished_at": job["finished_at"],
+        "error": job["error"]
+    }
+
+
+# =========================================================
+# BULK PAUSE / RESUME PLANS
+# =========================================================
+@router.post("/bulk/plans/pause")
+async def bulk_pause_plans(data: BulkFilter):
+
+    job = await start_bulk_job(
+        "pause_plans",
+        "plans",
+        await plan_query(data),
+        {"$set": {"is_active": False}},
+        data.chunk_size,
+        data.model_dump()
+    )
+
+    return job_response(job)
+
+
+@router.post("/bulk/plans/resume")
+async def bulk_resume_plans(data: BulkFilter):
+
+    job = await start_bulk_job(
+        "resume_plans",
+        "plans",
+        await plan_query(data),
+        {"$set": {"is_active": True}},
+        data.chunk_size,
+        data.model_dump()
+    )
+
+    return job_response(job)
+
+
+# =========================================================
+# BULK EXTEND SUBSCRIPTIONS
+# =========================================================
+@router.post("/bulk/subscriptions/extend")
+async def bulk_extend_subscriptions(data: BulkExtend):
+
+    if data.days <= 0:
+        raise HTTPException(status_code=400, detail="Days must be positive")
+
+    # Pipeline update so Mongo shifts each end_date in place
+    update = [
+        {
+            "$set": {
+                "end_date": {"$add": ["$end_date", data.days * 24 * 60 * 60 * 1000]}
+            }
+        },
+        # Reminder markers refer to the old end_date; start the windows over
+        {"$unset": ["reminder_window", "reminder_sent_at"]}
+    ]
+
+    job = await start_bulk_job(
+        "extend_subscriptions",
+        "subscriptions",
+        subscription_query(data),
+        update,
+        data.chunk_size,
+        data.model_dump(),
+        after_chunk=entitlements.reload_subscriptions
+    )
+
+    return job_response(job)
+
+
+# =========================================================
+# BULK REVOKE SUBSCRIPTIONS
+# =========================================================
+@router.post("/bulk/subscriptions/revoke")
+async def bulk_revoke_subscriptions(data: BulkFilter):
+
+    now = datetime.utcnow()
+
+    # Ending now hands the kick to the cleanup job on its next pass
+    update = {
+        "$set": {
+            "end_date": now,
+            "status": "revoked",
+            "revoked_at": now
+        }
+    }
+
+    job = await start_bulk_job(
+        "revoke_subscriptions",
+        "subscriptions",
+        subscription_query(data),
+        update,
+        data.chunk_size,
+        data.model_dump(),
+        after_chunk=entitlements.reload_subscriptions
+    )
+
+    return job_response(job)
+
+
+# =========================================================
+# BULK JOB PROGRESS
+# =========================================================
+@router.get("/bulk/jobs/{job_id}")
+async def get_bulk_job(job_id: str):
+
+    job = await db.bulk_jobs.find_one({"_id": validate_object_id(job_id)})
+
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    return job_response(job)
@@ -3,8 +3,9 @@ from datetime import datetime
 from bson import ObjectId
 import secrets
 
-from app.database import db
+from app.database import db, db_analytics
 from app.models.creator_model import CreatorCreate
+from app.services.group_directory import directory
 
 router = APIRouter()
 
@@ -44,6 +45,8 @@ async def register_creator(data: CreatorCreate):
 
     await db.creators.insert_one(creator_data)
 
+    directory.add_creator(creator_data)
+
     return {
         "message": "Creator registered successfully",
         "creator_code": creator_code
@@ -97,7 +100,7 @@ async def get_creator_by_telegram(telegram_id: int):
 @router.get("/creator/dashboard/{telegram_id}")
 async def creator_dashboard(telegram_id: int):
 
-    creator = await db.creators.find_one({
+    creator = await db_analytics.creators.find_one({
         "telegram_id": telegram_id,
         "is_active": True
     })
@@ -107,22 +110,25 @@ async def creator_dashboard(telegram_id: int):
 
     creator_id = creator["_id"]
 
-    plans_count = await db.plans.count_documents({
+    plans_count = await db_analytics.plans.count_documents({
         "creator_id": creator_id,
         "is_active": True
     })
 
     now = datetime.utcnow()
 
-    subscribers_count = await db.subscriptions.count_documents({
+    subscribers_count = await db_analytics.subscriptions.count_documents({
         "creator_id": creator_id,
         "end_date": {"$gt": now}
     })
 
+    group_ids = await directory.resolve_creator(creator_id)
+
     return {
         "name": creator.get("name", "Unknown"),
         "creator_code": creator["creator_code"],
-        "group_id": creator["group_ids"][0],
+        "group_id": group_ids[0] if group_ids else None,
+        "group_ids": group_ids,
         "plans_count": plans_count,
         "subscribers_count": subscribers_count
     }
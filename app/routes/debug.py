@@ -0,0 +1,10 @@
+from fastapi import APIRouter
+
+from app.utils.tracing import slow_requests
+
+router = APIRouter()
+
+
+@router.get("/debug/slow-requests")
+async def get_slow_requests():
+    return list(reversed(slow_requests))
@@ -0,0 +1,76 @@
+from fastapi import APIRouter, HTTPException
+from datetime import datetime
+from typing import Optional
+from bson import ObjectId
+
+from app.database import db_analytics
+from app.routes.plan import validate_object_id
+
+router = APIRouter()
+
+MAX_LIMIT = 1000
+
+
+def serialize(value):
+
+    if isinstance(value, ObjectId):
+        return str(value)
+
+    if isinstance(value, list):
+        return [serialize(v) for v in value]
+
+    if isinstance(value, dict):
+        return {k: serialize(v) for k, v in value.items()}
+
+    return value
+
+
+# =========================================================
+# QUERY EVENT LOG
+# =========================================================
+@router.get("/events")
+async def get_events(
+    type: Optional[str] = None,
+    user_id: Optional[int] = None,
+    creator_id: Optional[str] = None,
+    subscription_id: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    limit: int = 100
+):
+
+    if not 0 < limit <= MAX_LIMIT:
+        raise HTTPException(status_code=400, detail="Invalid limit")
+
+    query = {}
+
+    if type:
+        query["type"] = type
+
+    if user_id is not None:
+        query["user_id"] = user_id
+
+    if creator_id:
+        query["creator_id"] = validate_object_id(creator_id)
+
+    if subscription_id:
+        query["subscription_id"] = validate_object_id(subscription_id)
+
+    ts = {}
+
+    if since:
+        ts["$gte"] = since
+
+    if until:
+        ts["$lte"] = until
+
+    if ts:
+        query["ts"] = ts
+
+    events = []
+
+    async for event in db_analytics.events.find(query).sort("ts", -1).limit(limit):
+        event["id"] = str(event.pop("_id"))
+        events.append(serialize(event))
+
+    return events
@@ -3,6 +3,7 @@ from datetime import datetime
 from bson import ObjectId
 from app.database import db
 from app.models.group_model import GroupCreate
+from app.services.group_directory import directory
 
 router = APIRouter()
 
@@ -26,10 +27,12 @@ async def create_group(data: GroupCreate):
         "created_at": datetime.utcnow()
     }
 
-    result = await db.groups.insert_one(group)
+    await db.groups.insert_one(group)
+
+    directory.add_group(group)
 
     return {
-        "id": str(result.inserted_id),
+        "id": str(group["_id"]),
         "group_id": data.group_id,
         "name": data.name
     }
@@ -4,16 +4,20 @@ from bson import ObjectId
 import razorpay
 import json
 
-from telegram import Bot
-
 from app.database import db
 from app.config import settings
+from app.services.entitlement_index import entitlements
+from app.services.event_log import event_log
+from app.services.group_directory import directory
+from app.services.telegram_bot import bot
+from app.utils.tracing import span, trace_requests_response
 
 router = APIRouter()
 
 razorpay_client = razorpay.Client(
     auth=(settings.RAZORPAY_KEY_ID, settings.RAZORPAY_KEY_SECRET)
 )
+razorpay_client.session.hooks["response"].append(trace_requests_response)
 
 
 # =========================================================
@@ -23,7 +27,8 @@ razorpay_client = razorpay.Client(
 @router.post("/payment/create-order")
 async def create_order(user_id: int, plan_id: str):
 
-    plan = await db.plans.find_one({"_id": ObjectId(plan_id)})
+    with span("phase", "load_plan"):
+        plan = await db.plans.find_one({"_id": ObjectId(plan_id)})
 
     if not plan:
         raise HTTPException(404, "Plan not found")
@@ -32,26 +37,28 @@ async def create_order(user_id: int, plan_id: str):
 
     if max_users > 0:
 
-        active_users = await db.subscriptions.count_documents({
-            "plan_id": plan["_id"],
-            "end_date": {"$gt": datetime.utcnow()}
-        })
+        with span("phase", "check_capacity"):
+            active_users = await db.subscriptions.count_documents({
+                "plan_id": plan["_id"],
+                "end_date": {"$gt": datetime.utcnow()}
+            })
 
         if active_users >= max_users:
             raise HTTPException(400, "Plan is full")
 
     try:
 
-        payment = razorpay_client.payment_link.create({
-            "amount": plan["price"] * 100,
-            "currency": "INR",
-            "description": f"{plan['name']} Subscription",
-            "notify": {"sms": False, "email": False},
-            "notes": {
-                "plan_id": str(plan["_id"]),
-                "user_id": str(user_id)
-            }
-        })
+        with span("phase", "create_payment_link"):
+            payment = razorpay_client.payment_link.create({
+                "amount": plan["price"] * 100,
+                "currency": "INR",
+                "description": f"{plan['name']} Subscription",
+                "notify": {"sms": False, "email": False},
+                "notes": {
+                    "plan_id": str(plan["_id"]),
+                    "user_id": str(user_id)
+                }
+            })
 
     except Exception as e:
         print("Razorpay error:", e)
@@ -68,7 +75,8 @@ async def create_order(user_id: int, plan_id: str):
         "created_at": datetime.utcnow()
     }
 
-    await db.orders.insert_one(order_data)
+    with span("phase", "save_order"):
+        await db.orders.insert_one(order_data)
 
     return {
         "payment_url": payment["short_url"]
@@ -118,6 +126,16 @@ async def razorpay_webhook(request: Request):
     if not order:
         return {"status": "already_processed"}
 
+    await event_log.record(
+        "order.paid",
+        order_id=order["_id"],
+        user_id=order["user_id"],
+        creator_id=order["creator_id"],
+        plan_id=order["plan_id"],
+        amount=order["amount"],
+        payment_link_id=payment_link_id
+    )
+
     plan = await db.plans.find_one({"_id": order["plan_id"]})
 
     start = datetime.utcnow()
@@ -135,18 +153,40 @@ async def razorpay_webhook(request: Request):
         "created_at": datetime.utcnow()
     }
 
-    await db.subscriptions.insert_one(subscription_data)
+    result = await db.subscriptions.insert_one(subscription_data)
+
+    await event_log.record(
+        "subscription.created",
+        subscription_id=result.inserted_id,
+        order_id=order["_id"],
+        user_id=order["user_id"],
+        creator_id=order["creator_id"],
+        plan_id=order["plan_id"],
+        end_date=end
+    )
 
-    creator = await db.creators.find_one({"_id": order["creator_id"]})
+    group_ids = await directory.chats_for_subscription(
+        order["creator_id"],
+        order["plan_id"]
+    )
 
-    bot = Bot(token=settings.PLATFORM_BOT_TOKEN)
+    entitlements.grant(
+        await directory.chats_for_access(order["creator_id"], order["plan_id"]),
+        order["user_id"],
+        end
+    )
+
+    links = "\n".join(
+        f"https://t.me/{username}"
+        for username in directory.usernames(group_ids)
+    )
 
     await bot.send_message(
         chat_id=order["user_id"],
         text=(
             "✅ <b>Payment Successful!</b>\n\n"
-            "Click below to request access to the premium group:\n\n"
-            f"https://t.me/{creator['group_usernames'][0]}"
+            "Click below to request access to the premium groups:\n\n"
+            f"{links}"
         ),
         parse_mode="HTML"
     )
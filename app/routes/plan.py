@@ -3,8 +3,9 @@ from datetime import datetime
 from bson import ObjectId
 from bson.errors import InvalidId
 
-from app.database import db
+from app.database import db, db_analytics
 from app.models.plan_model import PlanCreate
+from app.services.group_directory import directory
 
 router = APIRouter()
 
@@ -38,6 +39,8 @@ async def create_plan(data: PlanCreate):
 
     result = await db.plans.insert_one(plan_data)
 
+    directory.add_plan(result.inserted_id, plan_data["group_id"])
+
     return {
         "plan_id": str(result.inserted_id),
         "name": data.name
@@ -149,18 +152,18 @@ async def get_plan_stats(plan_id: str):
 
     plan_object_id = validate_object_id(plan_id)
 
-    plan = await db.plans.find_one({"_id": plan_object_id})
+    plan = await db_analytics.plans.find_one({"_id": plan_object_id})
 
     if not plan:
         raise HTTPException(status_code=404, detail="Plan not found")
 
     now = datetime.utcnow()
 
-    total_subscribers = await db.subscriptions.count_documents({
+    total_subscribers = await db_analytics.subscriptions.count_documents({
         "plan_id": plan_object_id
     })
 
-    active_users = await db.subscriptions.count_documents({
+    active_users = await db_analytics.subscriptions.count_documents({
         "plan_id": plan_object_id,
         "end_date": {"$gt": now}
     })
@@ -180,7 +183,7 @@ async def get_plan_stats(plan_id: str):
         }
     ]
 
-    revenue_result = await db.orders.aggregate(pipeline).to_list(length=1)
+    revenue_result = await db_analytics.orders.aggregate(pipeline).to_list(length=1)
     total_revenue = revenue_result[0]["total"] if revenue_result else 0
 
     return {
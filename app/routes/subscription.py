@@ -1,6 +1,13 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, HTTPException
+from datetime import datetime, timedelta
 from bson import ObjectId
+import secrets
+
 from app.database import db
+from app.models.subscription_model import InviteClaim, InviteAck
+from app.routes.plan import validate_object_id
+from app.services.event_log import event_log
+from app.services.group_directory import directory
 
 router = APIRouter()
 
@@ -11,18 +18,24 @@ async def check_pending_subscription(telegram_id: int):
     sub = await db.subscriptions.find_one({
         "user_id": telegram_id,
         "is_active": True,
-        "invite_sent": False
+        "invite_sent": False,
+        "status": {"$ne": "revoked"},
+        "end_date": {"$gt": datetime.utcnow()}
     })
 
     if not sub:
         return {"status": "none"}
 
-    creator = await db.creators.find_one({"_id": sub["creator_id"]})
+    group_ids = await directory.chats_for_subscription(
+        sub["creator_id"],
+        sub.get("plan_id")
+    )
 
     return {
         "status": "ready",
         "subscription_id": str(sub["_id"]),
-        "group_id": creator["group_ids"][0]
+        "group_id": group_ids[0] if group_ids else None,
+        "group_ids": group_ids
     }
 
 
@@ -34,4 +47,135 @@ async def mark_invite_sent(subscription_id: str):
         {"$set": {"invite_sent": True}}
     )
 
-    return {"status": "updated"}
\ No newline at end of file
+    return {"status": "updated"}
+
+
+# =========================================================
+# CLAIM PENDING INVITES (BOT WORKERS)
+# =========================================================
+MAX_CLAIM = 500
+MAX_LEASE_SECONDS = 600
+
+
+@router.post("/subscriptions/invites/claim")
+async def claim_pending_invites(data: InviteClaim):
+
+    if not 0 < data.limit <= MAX_CLAIM:
+        raise HTTPException(status_code=400, detail="Invalid limit")
+
+    if not 0 < data.lease_seconds <= MAX_LEASE_SECONDS:
+        raise HTTPException(status_code=400, detail="Invalid lease")
+
+    now = datetime.utcnow()
+    lease_token = secrets.token_hex(8)
+
+    # Unleased, or the previous worker's lease ran out
+    claimable = {
+        "invite_sent": False,
+        "is_active": True,
+        "end_date": {"$gt": now},
+        "status": {"$ne": "revoked"},
+        "invite_lease_until": {"$not": {"$gte": now}}
+    }
+
+    candidates = await db.subscriptions.find(
+        claimable,
+        {"_id": 1}
+    ).limit(data.limit).to_list(length=data.limit)
+
+    if not candidates:
+        return {"lease_token": None, "invites": []}
+
+    # The filter is re-checked per document, so a racing worker can't
+    # take the same invite; it just gets fewer
+    await db.subscriptions.update_many(
+        {"_id": {"$in": [c["_id"] for c in candidates]}, **claimable},
+        {
+            "$set": {
+                "invite_lease_token": lease_token,
+                "invite_lease_owner": data.worker_id,
+                "invite_lease_until": now + timedelta(seconds=data.lease_seconds)
+            }
+        }
+    )
+
+    invites = []
+
+    async for sub in db.subscriptions.find(
+        {"invite_lease_token": lease_token},
+        {"user_id": 1, "creator_id": 1, "plan_id": 1}
+    ):
+
+        group_ids = await directory.chats_for_subscription(
+            sub["creator_id"],
+            sub.get("plan_id")
+        )
+
+        invites.append({
+            "subscription_id": str(sub["_id"]),
+            "user_id": sub["user_id"],
+            "group_ids": group_ids
+        })
+
+    return {
+        "lease_token": lease_token if invites else None,
+        "invites": invites
+    }
+
+
+# =========================================================
+# ACKNOWLEDGE CLAIMED INVITES
+# =========================================================
+@router.post("/subscriptions/invites/ack")
+async def ack_invites(data: InviteAck):
+
+    lease_fields = {
+        "invite_lease_token": "",
+        "invite_lease_owner": "",
+        "invite_lease_until": ""
+    }
+
+    acked = 0
+    released = 0
+
+    if data.sent_ids:
+
+        sent_ids = [validate_object_id(i) for i in data.sent_ids]
+        acked_at = datetime.utcnow()
+
+        result = await db.subscriptions.update_many(
+            {
+                "_id": {"$in": sent_ids},
+                "invite_lease_token": data.lease_token
+            },
+            {
+                "$set": {"invite_sent": True, "invite_sent_at": acked_at},
+                "$unset": lease_fields
+            }
+        )
+
+        acked = result.modified_count
+
+        # Only the ids this call actually updated; ids whose lease was lost
+        # to another worker are left out of the log
+        if acked:
+            async for sub in db.subscriptions.find(
+                {"_id": {"$in": sent_ids}, "invite_sent_at": acked_at},
+                {"_id": 1}
+            ):
+                await event_log.record("invite.acked", subscription_id=sub["_id"])
+
+    # Hand failed invites straight back instead of waiting out the lease
+    if data.failed_ids:
+
+        result = await db.subscriptions.update_many(
+            {
+                "_id": {"$in": [validate_object_id(i) for i in data.failed_ids]},
+                "invite_lease_token": data.lease_token
+            },
+            {"$unset": lease_fields}
+        )
+
+        released = result.modified_count
+
+    return {"acked": acked, "released": released}
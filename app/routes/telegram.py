@@ -0,0 +1,39 @@
+from fastapi import APIRouter, HTTPException, Request
+
+from app.config import settings
+from app.services.entitlement_index import check_join_request
+
+router = APIRouter()
+
+
+# =========================================================
+# TELEGRAM UPDATE WEBHOOK
+# =========================================================
+@router.post("/telegram/webhook")
+async def telegram_webhook(request: Request):
+
+    if settings.TELEGRAM_WEBHOOK_SECRET:
+
+        secret = request.headers.get("x-telegram-bot-api-secret-token")
+
+        if secret != settings.TELEGRAM_WEBHOOK_SECRET:
+            raise HTTPException(403, "Invalid webhook secret")
+
+    update = await request.json()
+
+    join_request = update.get("chat_join_request")
+
+    if not join_request:
+        return {"status": "ignored"}
+
+    chat_id = join_request["chat"]["id"]
+    user_id = join_request["from"]["id"]
+
+    approved = await check_join_request(chat_id, user_id)
+
+    # Answered in the webhook response, so no extra Bot API call is made
+    return {
+        "method": "approveChatJoinRequest" if approved else "declineChatJoinRequest",
+        "chat_id": chat_id,
+        "user_id": user_id
+    }
@@ -1,5 +1,6 @@
 from fastapi import APIRouter
 from app.database import db
+from app.utils.tracing import span
 from datetime import datetime
 
 router = APIRouter()
@@ -13,8 +14,9 @@ async def get_user_subscriptions(telegram_id: int):
 
     async for sub in subs:
 
-        plan = await db.plans.find_one({"_id": sub["plan_id"]})
-        creator = await db.creators.find_one({"_id": sub["creator_id"]})
+        with span("phase", "load_plan_and_creator"):
+            plan = await db.plans.find_one({"_id": sub["plan_id"]})
+            creator = await db.creators.find_one({"_id": sub["creator_id"]})
 
         now = datetime.utcnow()
 
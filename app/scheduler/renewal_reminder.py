@@ -1,28 +1,136 @@
+import asyncio
 from datetime import datetime, timedelta
+from pymongo import UpdateMany
 from telegram import Bot
 
 from app.database import db
 from app.config import settings
+from app.services.broadcast_service import deliver
+from app.services.event_log import event_log
+from app.services.telegram_bot import bot
+
+
+def reminder_text(time_left: timedelta):
+
+    # Worded from the actual time left, not the band: a sub first seen
+    # late in its band (missed run, reset markers) must not be told more
+    days_left = time_left.days
+
+    if days_left < 1:
+        when = "within a day"
+    elif days_left == 1:
+        when = "tomorrow"
+    else:
+        when = f"in {days_left} days"
+
+    return (
+        f"⏰ Your subscription expires {when}.\n\n"
+        "Renew now to keep access."
+    )
+
+
+def reminder_query(now: datetime, windows):
+
+    # One band per window: (previous window, this window]. A subscription
+    # only matches while its band's reminder hasn't been sent yet.
+    bands = []
+    lower = now
+
+    for window_days in windows:
+
+        upper = now + timedelta(days=window_days)
+
+        bands.append({
+            "end_date": {"$gt": lower, "$lte": upper},
+            "reminder_window": {"$not": {"$lte": window_days}}
+        })
+
+        lower = upper
+
+    return {"is_active": True, "$or": bands}
+
+
+async def send_reminder_batch(bot: Bot, batch, now: datetime, semaphore: asyncio.Semaphore):
+
+    async def send(sub, window_days):
+
+        # Too short to need this reminder, e.g. the 7d one on a 7-day plan
+        if sub["end_date"] - sub["start_date"] <= timedelta(days=window_days):
+            return "skipped"
+
+        async with semaphore:
+            return await deliver(bot, sub["user_id"], reminder_text(sub["end_date"] - now))
+
+    results = await asyncio.gather(*(
+        send(sub, window_days) for sub, window_days in batch
+    ))
+
+    sent_ids = {}
+
+    for (sub, window_days), result in zip(batch, results):
+
+        # Failed sends stay unmarked and are retried next run
+        if result == "failed":
+            continue
+
+        sent_ids.setdefault(window_days, []).append(sub["_id"])
+
+        if result == "sent":
+            await event_log.record(
+                "reminder.sent",
+                subscription_id=sub["_id"],
+                user_id=sub["user_id"],
+                window_days=window_days
+            )
+
+    if sent_ids:
+        await db.subscriptions.bulk_write(
+            [
+                UpdateMany(
+                    {"_id": {"$in": ids}},
+                    {"$set": {"reminder_window": window_days, "reminder_sent_at": now}}
+                )
+                for window_days, ids in sent_ids.items()
+            ],
+            ordered=False
+        )
+
+    return results.count("sent")
 
 
 async def send_renewal_reminders():
 
     now = datetime.utcnow()
-    tomorrow = now + timedelta(days=1)
+    windows = sorted(set(settings.REMINDER_WINDOWS_DAYS))
+
+    if not windows:
+        return
 
-    bot = Bot(token=settings.PLATFORM_BOT_TOKEN)
+    semaphore = asyncio.Semaphore(settings.BROADCAST_CONCURRENCY)
 
-    subs = db.subscriptions.find({
-        "end_date": {"$gte": now, "$lte": tomorrow},
-        "is_active": True
-    })
+    subs = db.subscriptions.find(
+        reminder_query(now, windows),
+        {"user_id": 1, "start_date": 1, "end_date": 1}
+    ).batch_size(settings.REMINDER_BATCH_SIZE)
+
+    batch = []
+    sent = 0
 
     async for sub in subs:
 
-        await bot.send_message(
-            chat_id=sub["user_id"],
-            text=(
-                "⏰ Your subscription expires tomorrow.\n\n"
-                "Renew now to keep access."
-            )
-        )
\ No newline at end of file
+        window_days = next(
+            w for w in windows
+            if sub["end_date"] <= now + timedelta(days=w)
+        )
+
+        batch.append((sub, window_days))
+
+        if len(batch) >= settings.REMINDER_BATCH_SIZE:
+            sent += await send_reminder_batch(bot, batch, now, semaphore)
+            batch = []
+
+    if batch:
+        sent += await send_reminder_batch(bot, batch, now, semaphore)
+
+    if sent:
+        print(f"Sent {sent} renewal reminders")
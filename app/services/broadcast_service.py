@@ -0,0 +1,233 @@
+import asyncio
+from datetime import datetime, timedelta
+
+from telegram import Bot
+from telegram.error import BadRequest, Forbidden, NetworkError, RetryAfter
+
+from app.database import db
+from app.services.event_log import event_log
+from app.config import settings
+from app.services.telegram_limits import bot_limiter, retry_seconds
+from app.services.telegram_bot import bot
+from app.utils.tracing import current_trace
+
+
+MAX_ATTEMPTS = 3
+
+# Keep references so running broadcasts aren't garbage collected
+running_broadcasts = set()
+
+
+# =========================================================
+# SUBSCRIBER STREAM
+# =========================================================
+async def active_subscriber_ids(creator_id, after_user_id=None):
+
+    query = {
+        "creator_id": creator_id,
+        "is_active": True,
+        "end_date": {"$gt": datetime.utcnow()}
+    }
+
+    if after_user_id is not None:
+        query["user_id"] = {"$gt": after_user_id}
+
+    # Served by the (creator_id, user_id, end_date) index in user_id order,
+    # so repeat subscriptions arrive together and the stream can resume
+    cursor = db.subscriptions.find(
+        query,
+        {"_id": 0, "user_id": 1}
+    ).sort("user_id", 1).batch_size(settings.BROADCAST_PAGE_SIZE)
+
+    last = None
+
+    async for sub in cursor:
+
+        if sub["user_id"] == last:
+            continue
+
+        last = sub["user_id"]
+        yield last
+
+
+# =========================================================
+# DELIVERY
+# =========================================================
+async def deliver(bot: Bot, user_id: int, text: str, parse_mode=None):
+
+    for attempt in range(MAX_ATTEMPTS):
+
+        await bot_limiter.acquire()
+
+        try:
+
+            await bot.send_message(
+                chat_id=user_id,
+                text=text,
+                parse_mode=parse_mode
+            )
+
+            return "sent"
+
+        except RetryAfter as e:
+            bot_limiter.pause(retry_seconds(e))
+
+        except Forbidden:
+            # User blocked the bot or deleted their account
+            return "blocked"
+
+        except BadRequest as e:
+            # Subclass of NetworkError, but retrying won't help
+            print("Send error:", e)
+            return "failed"
+
+        except NetworkError:
+            await asyncio.sleep(2 ** attempt)
+
+        except Exception as e:
+            print("Send error:", e)
+            return "failed"
+
+    return "failed"
+
+
+async def deliver_page(bot: Bot, broadcast, user_ids, semaphore: asyncio.Semaphore):
+
+    async def send(user_id):
+        async with semaphore:
+            return await deliver(
+                bot,
+                user_id,
+                broadcast["text"],
+                broadcast.get("parse_mode")
+            )
+
+    results = await asyncio.gather(*(send(user_id) for user_id in user_ids))
+
+    return {
+        "sent": results.count("sent"),
+        "blocked": results.count("blocked"),
+        "failed": results.count("failed")
+    }
+
+
+async def run_broadcast(broadcast_id):
+
+    # Started from a request; don't keep adding spans to its trace
+    current_trace.set(None)
+
+    broadcast = await db.broadcasts.find_one({"_id": broadcast_id})
+
+    semaphore = asyncio.Semaphore(settings.BROADCAST_CONCURRENCY)
+
+    page = []
+
+    async def flush():
+
+        counts = await deliver_page(bot, broadcast, page, semaphore)
+
+        # Progress is saved per page; a crash re-sends at most one page
+        result = await db.broadcasts.update_one(
+            {"_id": broadcast_id, "status": "running"},
+            {
+                "$inc": counts,
+                "$set": {
+                    "last_user_id": page[-1],
+                    "heartbeat_at": datetime.utcnow()
+                }
+            }
+        )
+
+        page.clear()
+
+        # Cancelled (or taken over) while this page was sending
+        return result.matched_count == 1
+
+    try:
+
+        async for user_id in active_subscriber_ids(
+            broadcast["creator_id"],
+            broadcast.get("last_user_id")
+        ):
+
+            page.append(user_id)
+
+            if len(page) >= settings.BROADCAST_PAGE_SIZE:
+                if not await flush():
+                    return
+
+        if page and not await flush():
+            return
+
+        await db.broadcasts.update_one(
+            {"_id": broadcast_id, "status": "running"},
+            {"$set": {"status": "completed", "finished_at": datetime.utcnow()}}
+        )
+
+        await event_log.record(
+            "broadcast.completed",
+            broadcast_id=broadcast_id,
+            creator_id=broadcast["creator_id"]
+        )
+
+    except Exception as e:
+
+        print("Broadcast error:", e)
+
+        await db.broadcasts.update_one(
+            {"_id": broadcast_id, "status": "running"},
+            {"$set": {"status": "failed", "error": str(e)}}
+        )
+
+
+# =========================================================
+# JOB CONTROL
+# =========================================================
+async def claim_broadcast(broadcast_id):
+
+    now = datetime.utcnow()
+    stale = now - timedelta(seconds=settings.BROADCAST_STALE_SECONDS)
+
+    # Atomic claim, so two workers never run the same broadcast
+    return await db.broadcasts.find_one_and_update(
+        {
+            "_id": broadcast_id,
+            "$or": [
+                {"status": {"$in": ["queued", "failed"]}},
+                {"status": "running", "heartbeat_at": {"$lt": stale}}
+            ]
+        },
+        {
+            "$set": {
+                "status": "running",
+                "heartbeat_at": now,
+                "error": None
+            }
+        }
+    )
+
+
+async def start_broadcast(broadcast_id):
+
+    claimed = await claim_broadcast(broadcast_id)
+
+    if not claimed:
+        return False
+
+    task = asyncio.create_task(run_broadcast(broadcast_id))
+    running_broadcasts.add(task)
+    task.add_done_callback(running_broadcasts.discard)
+
+    return True
+
+
+async def resume_stalled_broadcasts():
+
+    stale = datetime.utcnow() - timedelta(seconds=settings.BROADCAST_STALE_SECONDS)
+
+    async for broadcast in db.broadcasts.find(
+        {"status": "running", "heartbeat_at": {"$lt": stale}},
+        {"_id": 1}
+    ):
+        if await start_broadcast(broadcast["_id"]):
+            print(f"Resumed broadcast {broadcast['_id']}")
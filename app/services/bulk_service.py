@@ -0,0 +1,134 @@
+import asyncio
+from datetime import datetime
+
+from app.database import db
+from app.services.event_log import event_log
+from app.utils.tracing import current_trace
+
+
+# Keep references so running jobs aren't garbage collected
+running_jobs = set()
+
+
+async def start_bulk_job(kind: str, collection: str, query: dict, update, chunk_size: int, params: dict, after_chunk=None):
+
+    job = {
+        "kind": kind,
+        "collection": collection,
+        "params": params,
+        "status": "running",
+        "total": None,
+        "matched": 0,
+        "modified": 0,
+        "chunks": 0,
+        "created_at": datetime.utcnow(),
+        "finished_at": None,
+        "error": None
+    }
+
+    result = await db.bulk_jobs.insert_one(job)
+
+    task = asyncio.create_task(
+        run_bulk_job(result.inserted_id, collection, query, update, chunk_size, after_chunk)
+    )
+    running_jobs.add(task)
+    task.add_done_callback(running_jobs.discard)
+
+    job["_id"] = result.inserted_id
+
+    return job
+
+
+async def apply_chunk(job_id, collection: str, query: dict, update, ids, after_chunk=None):
+
+    result = await db[collection].update_many(
+        {"$and": [query, {"_id": {"$in": ids}}]},
+        update
+    )
+
+    if after_chunk:
+        await after_chunk(ids)
+
+    await db.bulk_jobs.update_one(
+        {"_id": job_id},
+        {
+            "$inc": {
+                "matched": result.matched_count,
+                "modified": result.modified_count,
+                "chunks": 1
+            },
+            # Resume point if the job is ever restarted
+            "$set": {"last_id": ids[-1]}
+        }
+    )
+
+    # Let request handlers run between chunks
+    await asyncio.sleep(0)
+
+
+async def run_bulk_job(job_id, collection: str, query: dict, update, chunk_size: int, after_chunk=None, last_id=None):
+
+    # Started from a request; don't keep adding spans to its trace
+    current_trace.set(None)
+
+    try:
+
+        # Counted here rather than in the request, which returns at once
+        total = await db[collection].count_documents(query)
+        await db.bulk_jobs.update_one({"_id": job_id}, {"$set": {"total": total}})
+
+        cursor_query = query
+
+        if last_id is not None:
+            cursor_query = {"$and": [query, {"_id": {"$gt": last_id}}]}
+
+        # One cursor in _id order, cut into chunks, so each write stays
+        # small without re-scanning the remaining matches per chunk
+        cursor = db[collection].find(
+            cursor_query,
+            {"_id": 1}
+        ).sort("_id", 1).batch_size(chunk_size)
+
+        ids = []
+
+        async for doc in cursor:
+
+            ids.append(doc["_id"])
+
+            if len(ids) >= chunk_size:
+                await apply_chunk(job_id, collection, query, update, ids, after_chunk)
+                ids = []
+
+        if ids:
+            await apply_chunk(job_id, collection, query, update, ids, after_chunk)
+
+        await db.bulk_jobs.update_one(
+            {"_id": job_id},
+            {"$set": {"status": "completed", "finished_at": datetime.utcnow()}}
+        )
+
+        job = await db.bulk_jobs.find_one({"_id": job_id})
+
+        await event_log.record(
+            "bulk_job.completed",
+            job_id=job_id,
+            kind=job["kind"],
+            params=job["params"],
+            matched=job["matched"],
+            modified=job["modified"]
+        )
+
+    except Exception as e:
+
+        print("Bulk job error:", e)
+
+        await db.bulk_jobs.update_one(
+            {"_id": job_id},
+            {
+                "$set": {
+                    "status": "failed",
+                    "error": str(e),
+                    "finished_at": datetime.utcnow()
+                }
+            }
+        )
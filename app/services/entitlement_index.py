@@ -0,0 +1,178 @@
+from datetime import datetime
+
+from app.database import db
+from app.services.group_directory import directory
+
+
+# In-process index of who may join which group:
+# (telegram chat id, telegram user id) -> latest active end_date
+class EntitlementIndex:
+
+    def __init__(self):
+        self.expiry = {}
+        self.loading = False
+        self.recent = []
+
+    def grant(self, chat_ids, user_id: int, end_date: datetime):
+
+        for chat_id in chat_ids:
+
+            key = (chat_id, user_id)
+            current = self.expiry.get(key)
+
+            if current is None or end_date > current:
+                self.expiry[key] = end_date
+
+        # Replayed over the fresh snapshot once a reload finishes
+        if self.loading:
+            self.recent.append((chat_ids, user_id, end_date))
+
+    def expire(self, chat_ids, user_id: int, now: datetime):
+
+        for chat_id in chat_ids:
+
+            key = (chat_id, user_id)
+            current = self.expiry.get(key)
+
+            # Another, longer subscription covering the same group keeps access
+            if current is not None and current <= now:
+                del self.expiry[key]
+
+    def is_entitled(self, chat_id: int, user_id: int, now: datetime):
+
+        end_date = self.expiry.get((chat_id, user_id))
+
+        return end_date is not None and end_date > now
+
+    async def load(self):
+
+        now = datetime.utcnow()
+        expiry = {}
+
+        self.loading = True
+        self.recent = []
+
+        try:
+
+            async for sub in db.subscriptions.find(
+                {
+                    "is_active": True,
+                    "end_date": {"$gt": now},
+                    "status": {"$ne": "revoked"}
+                },
+                {"_id": 0, "creator_id": 1, "plan_id": 1, "user_id": 1, "end_date": 1}
+            ).batch_size(10000):
+
+                chat_ids = await directory.chats_for_access(
+                    sub["creator_id"],
+                    sub.get("plan_id")
+                )
+
+                for chat_id in chat_ids:
+
+                    key = (chat_id, sub["user_id"])
+
+                    if key not in expiry or sub["end_date"] > expiry[key]:
+                        expiry[key] = sub["end_date"]
+
+            self.expiry = expiry
+
+            for chat_ids, user_id, end_date in self.recent:
+                self.grant(chat_ids, user_id, end_date)
+
+        finally:
+            self.loading = False
+            self.recent = []
+
+    async def reload_subscriptions(self, subscription_ids):
+
+        # Re-derive the entries touched by a bulk edit from Mongo
+        creators = set()
+        users = set()
+        keys = set()
+
+        async for sub in db.subscriptions.find(
+            {"_id": {"$in": subscription_ids}},
+            {"_id": 0, "creator_id": 1, "plan_id": 1, "user_id": 1}
+        ):
+
+            chat_ids = await directory.chats_for_access(
+                sub["creator_id"],
+                sub.get("plan_id")
+            )
+
+            creators.add(sub["creator_id"])
+            users.add(sub["user_id"])
+            keys.update((chat_id, sub["user_id"]) for chat_id in chat_ids)
+
+        if not keys:
+            return
+
+        for key in keys:
+            self.expiry.pop(key, None)
+
+        now = datetime.utcnow()
+
+        async for sub in db.subscriptions.find(
+            {
+                "creator_id": {"$in": list(creators)},
+                "user_id": {"$in": list(users)},
+                "is_active": True,
+                "end_date": {"$gt": now},
+                "status": {"$ne": "revoked"}
+            },
+            {"_id": 0, "creator_id": 1, "plan_id": 1, "user_id": 1, "end_date": 1}
+        ):
+
+            chat_ids = await directory.chats_for_access(
+                sub["creator_id"],
+                sub.get("plan_id")
+            )
+
+            self.grant(
+                [c for c in chat_ids if (c, sub["user_id"]) in keys],
+                sub["user_id"],
+                sub["end_date"]
+            )
+
+
+entitlements = EntitlementIndex()
+
+
+async def load_access_indexes():
+    await directory.load()
+    await entitlements.load()
+
+
+async def check_join_request(chat_id: int, user_id: int):
+
+    now = datetime.utcnow()
+
+    if entitlements.is_entitled(chat_id, user_id, now):
+        return True
+
+    creator_id = await directory.resolve_chat(chat_id)
+
+    if creator_id is None:
+        return False
+
+    # A miss may be a payment handled by another worker; confirm before
+    # declining, and only for a subscription that covers this group
+    async for sub in db.subscriptions.find(
+        {
+            "creator_id": creator_id,
+            "user_id": user_id,
+            "is_active": True,
+            "end_date": {"$gt": now},
+            "status": {"$ne": "revoked"}
+        },
+        {"plan_id": 1, "end_date": 1}
+    ):
+
+        chat_ids = await directory.chats_for_access(creator_id, sub.get("plan_id"))
+
+        if chat_id in chat_ids:
+            entitlements.grant(chat_ids, user_id, sub["end_date"])
+            return True
+
+    return False
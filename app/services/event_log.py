@@ -0,0 +1,129 @@
+import asyncio
+from datetime import datetime
+from pymongo.errors import CollectionInvalid
+
+from app.database import db
+from app.config import settings
+
+
+STOP = object()
+
+
+# Append-only log of payment and subscription state changes. Callers only
+# enqueue; a background task writes batches with insert_many.
+class EventLog:
+
+    def __init__(self):
+        self.queue = asyncio.Queue(maxsize=settings.EVENT_LOG_QUEUE_SIZE)
+        self.task = None
+        self.dropped = 0
+
+    async def record(self, event_type: str, **fields):
+
+        event = {"ts": datetime.utcnow(), "type": event_type, **fields}
+
+        try:
+            self.queue.put_nowait(event)
+            return
+        except asyncio.QueueFull:
+            pass
+
+        # Queue is full: make the caller wait a little, then give up
+        # rather than stall a payment or cleanup path on the log
+        try:
+            await asyncio.wait_for(
+                self.queue.put(event),
+                settings.EVENT_LOG_MAX_WAIT_MS / 1000
+            )
+        except asyncio.TimeoutError:
+            self.dropped += 1
+
+    async def next_batch(self):
+
+        loop = asyncio.get_running_loop()
+
+        batch = [await self.queue.get()]
+        deadline = loop.time() + settings.EVENT_LOG_FLUSH_SECONDS
+
+        while len(batch) < settings.EVENT_LOG_BATCH_SIZE and batch[-1] is not STOP:
+
+            try:
+                batch.append(self.queue.get_nowait())
+                continue
+            except asyncio.QueueEmpty:
+                pass
+
+            timeout = deadline - loop.time()
+
+            if timeout <= 0:
+                break
+
+            try:
+                batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+
+        return batch
+
+    async def write(self, batch):
+
+        if not batch:
+            return
+
+        try:
+            await db.events.insert_many(batch, ordered=False)
+        except Exception as e:
+            self.dropped += len(batch)
+            print("Event log write error:", e)
+
+    async def run(self):
+
+        while True:
+
+            batch = await self.next_batch()
+
+            if batch[-1] is STOP:
+                await self.write(batch[:-1])
+                return
+
+            await self.write(batch)
+
+    def start(self):
+        if self.task is None:
+            self.task = asyncio.create_task(self.run())
+
+    async def stop(self):
+
+        if self.task is None:
+            return
+
+        # A sentinel rather than cancel(), so everything queued before it
+        # is written before the task exits
+        await self.queue.put(STOP)
+        await self.task
+
+        self.task = None
+
+
+event_log = EventLog()
+
+
+async def setup_event_log():
+
+    try:
+        await db.create_collection(
+            "events",
+            capped=True,
+            size=settings.EVENT_LOG_CAPPED_BYTES
+        )
+    except CollectionInvalid:
+        # Already created, possibly by another worker
+        pass
+
+    await db.events.create_index([("ts", -1)])
+    await db.events.create_index([("type", 1), ("ts", -1)])
+    await db.events.create_index([("creator_id", 1), ("ts", -1)], sparse=True)
+    await db.events.create_index([("user_id", 1), ("ts", -1)])
+    await db.events.create_index([("subscription_id", 1), ("ts", -1)], sparse=True)
+
+    event_log.start()
@@ -0,0 +1,168 @@
+from app.database import db
+
+
+# In-process map between Telegram chats, the creators that own them and
+# the plans bound to them. Groups change rarely, so this is loaded once,
+# patched on writes and filled in lazily on misses.
+class GroupDirectory:
+
+    def __init__(self):
+        self.chat_creator = {}
+        self.creator_chats = {}
+        self.chat_username = {}
+        self.group_chat = {}
+        self.plan_chat = {}
+
+    def add(self, creator_id, chat_id: int, username=None, group_object_id=None):
+
+        self.chat_creator[chat_id] = creator_id
+
+        # Lists keep the creator's primary group first
+        chats = self.creator_chats.setdefault(creator_id, [])
+
+        if chat_id not in chats:
+            chats.append(chat_id)
+
+        if username:
+            self.chat_username[chat_id] = username
+
+        if group_object_id is not None:
+            self.group_chat[group_object_id] = chat_id
+
+    def add_plan(self, plan_id, group_object_id):
+        # Unknown groups stay unresolved and are looked up on first use
+        if group_object_id in self.group_chat:
+            self.plan_chat[plan_id] = self.group_chat[group_object_id]
+
+    def add_creator(self, creator):
+        for i, chat_id in enumerate(creator.get("group_ids", [])):
+            usernames = creator.get("group_usernames", [])
+            self.add(creator["_id"], chat_id, usernames[i] if i < len(usernames) else None)
+
+    def add_group(self, group):
+        self.add(group["creator_id"], group["group_id"], group.get("username"), group["_id"])
+
+    def creator_for_chat(self, chat_id: int):
+        return self.chat_creator.get(chat_id)
+
+    def chats_for_creator(self, creator_id):
+        return self.creator_chats.get(creator_id, [])
+
+    def usernames(self, chat_ids):
+        return [self.chat_username[c] for c in chat_ids if c in self.chat_username]
+
+    async def resolve_chat(self, chat_id: int):
+
+        creator_id = self.chat_creator.get(chat_id)
+
+        if creator_id is not None:
+            return creator_id
+
+        # Registered on another worker since we loaded
+        group = await db.groups.find_one({"group_id": chat_id})
+
+        if group:
+            self.add_group(group)
+            return group["creator_id"]
+
+        creator = await db.creators.find_one(
+            {"group_ids": chat_id},
+            {"group_ids": 1, "group_usernames": 1}
+        )
+
+        if not creator:
+            return None
+
+        self.add_creator(creator)
+
+        return creator["_id"]
+
+    async def resolve_creator(self, creator_id):
+
+        if creator_id in self.creator_chats:
+            return self.creator_chats[creator_id]
+
+        creator = await db.creators.find_one(
+            {"_id": creator_id},
+            {"group_ids": 1, "group_usernames": 1}
+        )
+
+        groups = await db.groups.find({"creator_id": creator_id}).to_list(length=None)
+
+        if creator:
+            self.add_creator(creator)
+
+        for group in groups:
+            self.add_group(group)
+
+        # Remember creators without groups too, so misses aren't re-queried
+        return self.creator_chats.setdefault(creator_id, [])
+
+    async def resolve_plan(self, plan_id):
+
+        if plan_id is None:
+            return None
+
+        if plan_id in self.plan_chat:
+            return self.plan_chat[plan_id]
+
+        plan = await db.plans.find_one({"_id": plan_id}, {"group_id": 1})
+
+        if not plan or plan.get("group_id") is None:
+            self.plan_chat[plan_id] = None
+            return None
+
+        if plan["group_id"] not in self.group_chat:
+
+            group = await db.groups.find_one({"_id": plan["group_id"]})
+
+            if group:
+                self.add_group(group)
+
+        self.add_plan(plan_id, plan["group_id"])
+
+        return self.plan_chat.setdefault(plan_id, None)
+
+    async def chats_for_subscription(self, creator_id, plan_id=None):
+
+        chats = list(await self.resolve_creator(creator_id))
+
+        plan_chat = await self.resolve_plan(plan_id)
+
+        if plan_chat is not None and plan_chat not in chats:
+            chats.append(plan_chat)
+
+        return chats
+
+    async def chats_for_access(self, creator_id, plan_id=None):
+
+        # A plan bound to a group admits to that group only; plans without
+        # one cover the creator's groups
+        plan_chat = await self.resolve_plan(plan_id)
+
+        if plan_chat is not None:
+            return [plan_chat]
+
+        return await self.chats_for_subscription(creator_id, plan_id)
+
+    async def load(self):
+
+        loaded = GroupDirectory()
+
+        async for creator in db.creators.find({}, {"group_ids": 1, "group_usernames": 1}):
+            loaded.add_creator(creator)
+
+        async for group in db.groups.find({}):
+            loaded.add_group(group)
+
+        async for plan in db.plans.find({}, {"group_id": 1}):
+            loaded.add_plan(plan["_id"], plan.get("group_id"))
+
+        self.chat_creator = loaded.chat_creator
+        self.creator_chats = loaded.creator_chats
+        self.chat_username = loaded.chat_username
+        self.group_chat = loaded.group_chat
+        self.plan_chat = loaded.plan_chat
+
+
+directory = GroupDirectory()
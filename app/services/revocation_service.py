@@ -0,0 +1,76 @@
+import asyncio
+from datetime import datetime, timedelta
+
+from telegram import Bot
+from telegram.error import BadRequest, Forbidden, NetworkError, RetryAfter
+
+from app.config import settings
+from app.services.telegram_limits import bot_limiter, chat_limiter, retry_seconds
+
+
+MAX_ATTEMPTS = 3
+
+# 400s where the user can no longer be in the chat, so there's nothing to remove
+GONE_USER_ERRORS = (
+    "user not found",
+    "participant_id_invalid",
+)
+
+
+async def kick_from_chat(bot: Bot, chat_id: int, user_id: int):
+
+    limiter = chat_limiter(chat_id)
+
+    for attempt in range(MAX_ATTEMPTS):
+
+        await limiter.acquire()
+        await bot_limiter.acquire()
+
+        try:
+
+            # A short ban expires on Telegram's side, so no unban call is needed
+            await bot.ban_chat_member(
+                chat_id,
+                user_id,
+                until_date=datetime.utcnow() + timedelta(seconds=settings.KICK_BAN_SECONDS)
+            )
+
+            return True
+
+        except RetryAfter as e:
+            limiter.pause(retry_seconds(e))
+
+        except BadRequest as e:
+
+            if any(m in e.message.lower() for m in GONE_USER_ERRORS):
+                print(f"Kick skipped in {chat_id}:", e)
+                return True
+
+            # Missing rights, chat not found, chat owner, ...;
+            # retried on the next cleanup pass
+            print(f"Kick failed in {chat_id}:", e)
+            return False
+
+        except Forbidden as e:
+            # Bot was removed from the chat; retried on the next cleanup pass
+            print(f"Kick forbidden in {chat_id}:", e)
+            return False
+
+        except NetworkError:
+            await asyncio.sleep(2 ** attempt)
+
+        except Exception as e:
+            print(f"Kick error in {chat_id}:", e)
+            return False
+
+    return False
+
+
+async def revoke_user(bot: Bot, chat_ids, user_id: int):
+
+    # One concurrent kick per group; returns the chats that still failed
+    results = await asyncio.gather(*(
+        kick_from_chat(bot, chat_id, user_id) for chat_id in chat_ids
+    ))
+
+    return [chat_id for chat_id, ok in zip(chat_ids, results) if not ok]
@@ -1,48 +1,188 @@
+import asyncio
 from datetime import datetime
+from pymongo import UpdateOne
 from telegram import Bot
 from app.database import db
 from app.config import settings
+from app.services.entitlement_index import entitlements
+from app.services.event_log import event_log
+from app.services.group_directory import directory
+from app.services.revocation_service import revoke_user
+from app.services.telegram_bot import bot
 
 
-async def remove_expired_subscriptions():
+BATCH_SIZE = 200
 
-    now = datetime.utcnow()
 
-    expired_subs = db.subscriptions.find({
-        "end_date": {"$lt": now},
-        "is_active": True
-    })
+async def renewed_users(batch, now: datetime):
 
-    bot = Bot(token=settings.PLATFORM_BOT_TOKEN)
+    # One lookup per batch for users who still hold another active sub to
+    # the same creator, e.g. a renewal, which inserts a new document
+    pairs = {(sub["creator_id"], sub["user_id"]) for sub in batch}
 
-    async for sub in expired_subs:
+    renewed = set()
+
+    async for other in db.subscriptions.find(
+        {
+            "creator_id": {"$in": list({c for c, _ in pairs})},
+            "user_id": {"$in": list({u for _, u in pairs})},
+            "is_active": True,
+            "end_date": {"$gt": now},
+            "status": {"$ne": "revoked"}
+        },
+        {"_id": 0, "creator_id": 1, "user_id": 1}
+    ):
+        renewed.add((other["creator_id"], other["user_id"]))
+
+    return renewed & pairs
+
+
+async def remove_subscription(bot: Bot, sub, now: datetime, semaphore: asyncio.Semaphore, renewed: bool):
+
+    if renewed:
+
+        # Access continues under the newer subscription; don't kick
+        await event_log.record(
+            "subscription.expired",
+            subscription_id=sub["_id"],
+            user_id=sub["user_id"],
+            creator_id=sub["creator_id"],
+            renewed=True
+        )
+
+        return UpdateOne(
+            {"_id": sub["_id"]},
+            {
+                "$set": {
+                    "is_active": False,
+                    "status": "revoked" if sub.get("status") == "revoked" else "expired"
+                },
+                "$unset": {"revoke_pending_chats": "", "revoke_attempts": ""}
+            }
+        )
+
+    # Earlier partial failure: only retry the groups that didn't go through
+    chat_ids = sub.get("revoke_pending_chats") or await directory.chats_for_subscription(
+        sub["creator_id"],
+        sub.get("plan_id")
+    )
+
+    async with semaphore:
+        failed = await revoke_user(bot, chat_ids, sub["user_id"]) if chat_ids else []
+
+    attempts = sub.get("revoke_attempts", 0) + 1
+
+    if failed and attempts < settings.REVOKE_MAX_ATTEMPTS:
+
+        print(f"Removal of user {sub['user_id']} pending in {failed}")
+
+        await event_log.record(
+            "user.kick_failed",
+            subscription_id=sub["_id"],
+            user_id=sub["user_id"],
+            creator_id=sub["creator_id"],
+            chat_ids=failed,
+            attempt=attempts
+        )
+
+        return UpdateOne(
+            {"_id": sub["_id"]},
+            {"$set": {"revoke_pending_chats": failed, "revoke_attempts": attempts}}
+        )
 
-        try:
+    entitlements.expire(
+        await directory.chats_for_access(sub["creator_id"], sub.get("plan_id")),
+        sub["user_id"],
+        now
+    )
 
-            creator = await db.creators.find_one({"_id": sub["creator_id"]})
+    update = {
+        "$set": {
+            "is_active": False,
+            # Keep bulk revokes distinguishable from natural expiry
+            "status": "revoked" if sub.get("status") == "revoked" else "expired"
+        },
+        "$unset": {"revoke_pending_chats": "", "revoke_attempts": ""}
+    }
 
-            if not creator:
-                continue
+    if failed:
+        print(f"Gave up removing user {sub['user_id']} from {failed}")
+        update["$set"]["revoke_failed_chats"] = failed
+    else:
+        print(f"Removed user {sub['user_id']}")
 
-            group_id = creator["group_ids"][0] if creator.get("group_ids") else None
+    await event_log.record(
+        "user.kicked",
+        subscription_id=sub["_id"],
+        user_id=sub["user_id"],
+        creator_id=sub["creator_id"],
+        chat_ids=[c for c in chat_ids if c not in failed],
+        failed_chat_ids=failed
+    )
 
-            if not group_id:
-                continue
+    return UpdateOne({"_id": sub["_id"]}, update)
 
-            await bot.ban_chat_member(group_id, sub["user_id"])
-            await bot.unban_chat_member(group_id, sub["user_id"])
 
-            await db.subscriptions.update_one(
-                {"_id": sub["_id"]},
-                {
-                    "$set": {
-                        "is_active": False,
-                        "status": "expired"
-                    }
-                }
+async def remove_batch(bot: Bot, batch, now: datetime, semaphore: asyncio.Semaphore):
+
+    renewed = await renewed_users(batch, now)
+
+    results = await asyncio.gather(
+        *(
+            remove_subscription(
+                bot,
+                sub,
+                now,
+                semaphore,
+                (sub["creator_id"], sub["user_id"]) in renewed
             )
+            for sub in batch
+        ),
+        return_exceptions=True
+    )
+
+    updates = []
+
+    for result in results:
+        if isinstance(result, Exception):
+            print("Removal error:", result)
+        else:
+            updates.append(result)
+
+    if updates:
+        await db.subscriptions.bulk_write(updates, ordered=False)
+
+
+async def remove_expired_subscriptions():
+
+    now = datetime.utcnow()
+
+    expired_subs = db.subscriptions.find(
+        {
+            "end_date": {"$lt": now},
+            "is_active": True
+        },
+        {
+            "user_id": 1,
+            "creator_id": 1,
+            "plan_id": 1,
+            "status": 1,
+            "revoke_pending_chats": 1,
+            "revoke_attempts": 1
+        }
+    )
+
+    semaphore = asyncio.Semaphore(settings.KICK_CONCURRENCY)
+
+    batch = []
+
+    async for sub in expired_subs:
+
+        batch.append(sub)
 
-            print(f"Removed user {sub['user_id']}")
+        if len(batch) >= BATCH_SIZE:
+            await remove_batch(bot, batch, now, semaphore)
+            batch = []
 
-        except Exception as e:
-            print("Removal error:", e)
\ No newline at end of file
+    if batch:
+        await remove_batch(bot, batch, now, semaphore)
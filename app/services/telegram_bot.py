@@ -0,0 +1,25 @@
+from telegram import Bot
+
+from app.config import settings
+from app.utils.tracing import TracedHTTPXRequest
+
+
+# One bot and one connection pool for the whole process: payment
+# messages, broadcasts, reminders and cleanup kicks all share it, so the
+# pool is sized for their combined concurrency (BROADCAST_CONCURRENCY +
+# KICK_CONCURRENCY, 20 each by default) with headroom. Every Bot API
+# call goes through the traced request.
+bot = Bot(
+    token=settings.PLATFORM_BOT_TOKEN,
+    request=TracedHTTPXRequest(
+        connection_pool_size=settings.TELEGRAM_CONNECTION_POOL_SIZE
+    )
+)
+
+
+async def start_bot():
+    await bot.initialize()
+
+
+async def stop_bot():
+    await bot.shutdown()
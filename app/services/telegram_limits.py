@@ -0,0 +1,31 @@
+from datetime import timedelta
+
+from telegram.error import RetryAfter
+
+from app.config import settings
+from app.utils.rate_limit import RateLimiter
+
+
+# One limiter per process: Telegram's global cap is per bot
+bot_limiter = RateLimiter(settings.BROADCAST_RATE_PER_SECOND, burst=settings.BROADCAST_CONCURRENCY)
+
+# Admin actions are also throttled per chat
+chat_limiters = {}
+
+
+def chat_limiter(chat_id: int):
+
+    limiter = chat_limiters.get(chat_id)
+
+    if limiter is None:
+        limiter = RateLimiter(settings.KICK_PER_CHAT_RATE, burst=settings.KICK_PER_CHAT_BURST)
+        chat_limiters[chat_id] = limiter
+
+    return limiter
+
+
+def retry_seconds(error: RetryAfter):
+    retry_after = error.retry_after
+    if isinstance(retry_after, timedelta):
+        return retry_after.total_seconds()
+    return float(retry_after)
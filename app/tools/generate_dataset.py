@@ -0,0 +1,377 @@
+"""
+Synthetic dataset generator for load and capacity testing.
+
+Writes creators, groups, plans, orders and subscriptions shaped like the
+documents the API itself writes, deterministically from a seed.
+
+    python -m app.tools.generate_dataset --subscriptions 2000000 --drop
+"""
+import argparse
+import asyncio
+import calendar
+import random
+import string
+import struct
+import time
+from datetime import datetime, timedelta
+from itertools import accumulate
+
+from bson import ObjectId
+from motor.motor_asyncio import AsyncIOMotorClient
+
+
+PLAN_DURATIONS = [7, 30, 30, 30, 90, 365]
+PLAN_PRICES = [49, 99, 149, 199, 299, 499, 999]
+
+CREATOR_ID_BASE = 5_000_000_000
+USER_ID_BASE = 100_000_000
+GROUP_ID_BASE = -1_000_000_000_000
+
+
+# =====================================================
+# HELPERS
+# =====================================================
+def object_id(rng: random.Random, created_at: datetime):
+    # Timestamp prefix keeps _id order close to created_at like real inserts
+    # Naive datetimes here are UTC; timegm keeps ids independent of host timezone
+    timestamp = calendar.timegm(created_at.utctimetuple())
+    return ObjectId(struct.pack(">I", timestamp) + rng.getrandbits(64).to_bytes(8, "big"))
+
+
+def zipf_cum_weights(n: int, skew: float):
+    # skew 0 is uniform, larger values concentrate traffic on the first ids
+    return list(accumulate(1.0 / (rank ** skew) for rank in range(1, n + 1)))
+
+
+def random_token(rng: random.Random, length: int):
+    alphabet = string.ascii_letters + string.digits
+    return "".join(rng.choice(alphabet) for _ in range(length))
+
+
+# =====================================================
+# CREATORS, GROUPS AND PLANS
+# =====================================================
+def build_catalog(rng: random.Random, args, now: datetime):
+
+    creators = []
+    groups = []
+    plans = []
+
+    # Per creator: (creator _id, [(plan _id, duration, price)])
+    catalog = []
+
+    codes = set()
+    group_seq = 0
+
+    for i in range(args.creators):
+
+        created_at = now - timedelta(
+            days=args.days_back + rng.uniform(0, 180)
+        )
+        creator_id = object_id(rng, created_at)
+
+        creator_code = f"{rng.getrandbits(32):08x}"
+
+        while creator_code in codes:
+            creator_code = f"{rng.getrandbits(32):08x}"
+
+        codes.add(creator_code)
+
+        group_count = 1
+
+        if args.max_groups > 1 and rng.random() < 0.2:
+            group_count = rng.randint(2, args.max_groups)
+
+        creator_groups = []
+
+        for j in range(group_count):
+
+            group_seq += 1
+            group_object_id = object_id(rng, created_at)
+
+            group = {
+                "_id": group_object_id,
+                "creator_id": creator_id,
+                "group_id": GROUP_ID_BASE - group_seq,
+                "username": f"premium_{i}_{j}",
+                "name": f"Premium Group {i}-{j}",
+                "is_public": rng.random() < 0.3,
+                "created_at": created_at
+            }
+
+            groups.append(group)
+            creator_groups.append(group)
+
+        creators.append({
+            "_id": creator_id,
+            "telegram_id": CREATOR_ID_BASE + i,
+            "name": f"Creator {i}",
+            "creator_code": creator_code,
+            "group_ids": [g["group_id"] for g in creator_groups],
+            "group_usernames": [g["username"] for g in creator_groups],
+            "created_at": created_at,
+            "is_active": rng.random() < 0.97
+        })
+
+        creator_plans = []
+
+        for _ in range(rng.randint(1, args.max_plans)):
+
+            duration = rng.choice(PLAN_DURATIONS)
+            price = rng.choice(PLAN_PRICES)
+            plan_id = object_id(rng, created_at)
+
+            plans.append({
+                "_id": plan_id,
+                "group_id": rng.choice(creator_groups)["_id"],
+                "creator_id": creator_id,
+                "name": f"{duration} Day Access",
+                "price": price,
+                "duration_days": duration,
+                "description": "",
+                "max_users": 0 if rng.random() < 0.9 else rng.choice([50, 100, 500]),
+                "created_at": created_at,
+                "is_active": rng.random() < 0.9
+            })
+
+            creator_plans.append((plan_id, duration, price))
+
+        catalog.append((creator_id, creator_plans))
+
+    return creators, groups, plans, catalog
+
+
+# =====================================================
+# ORDERS AND SUBSCRIPTIONS
+# =====================================================
+def build_order(rng: random.Random, user_id, creator_id, plan_id, price, created_at, status):
+
+    link_id = "plink_" + random_token(rng, 14)
+
+    order = {
+        "_id": object_id(rng, created_at),
+        "user_id": user_id,
+        "plan_id": plan_id,
+        "creator_id": creator_id,
+        "amount": price,
+        "razorpay_payment_link_id": link_id,
+        "payment_url": "https://rzp.io/i/" + random_token(rng, 8),
+        "status": status,
+        "created_at": created_at
+    }
+
+    if status == "paid":
+        order["paid_at"] = created_at + timedelta(minutes=rng.uniform(0.5, 10))
+
+    return order
+
+
+def build_subscription_batch(rng: random.Random, args, now, catalog, creator_weights, user_weights, cluster_days, size):
+
+    orders = []
+    subscriptions = []
+
+    creator_picks = rng.choices(catalog, cum_weights=creator_weights, k=size)
+    user_picks = rng.choices(range(args.users), cum_weights=user_weights, k=size)
+
+    for (creator_id, creator_plans), user_index in zip(creator_picks, user_picks):
+
+        plan_id, duration, price = rng.choice(creator_plans)
+        user_id = USER_ID_BASE + user_index
+
+        # Campaign days bunch up purchases, which bunches up expiries
+        if cluster_days and rng.random() < args.expiry_cluster:
+            days_ago = rng.choice(cluster_days) + rng.uniform(0, 0.25)
+        else:
+            days_ago = rng.uniform(0, args.days_back)
+
+        order_created = now - timedelta(days=days_ago)
+        order = build_order(rng, user_id, creator_id, plan_id, price, order_created, "paid")
+
+        start = order["paid_at"]
+        end = start + timedelta(days=duration)
+
+        is_active = end > now
+
+        # Expired but not yet swept by the cleanup job
+        if not is_active and rng.random() < args.stale_fraction:
+            is_active = True
+
+        subscriptions.append({
+            "_id": object_id(rng, start),
+            "user_id": user_id,
+            "creator_id": creator_id,
+            "plan_id": plan_id,
+            "start_date": start,
+            "end_date": end,
+            "invite_sent": (now - start) > timedelta(hours=1) or rng.random() < 0.5,
+            "status": "active" if is_active else "expired",
+            "is_active": is_active,
+            "created_at": start
+        })
+
+        orders.append(order)
+
+        # Abandoned checkouts never reach the webhook
+        if rng.random() < args.pending_ratio:
+            orders.append(build_order(
+                rng,
+                user_id,
+                creator_id,
+                plan_id,
+                price,
+                now - timedelta(days=rng.uniform(0, args.days_back)),
+                "pending"
+            ))
+
+    return orders, subscriptions
+
+
+# =====================================================
+# LOADER
+# =====================================================
+class BatchLoader:
+
+    def __init__(self, db, concurrency: int):
+        self.db = db
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.pending = set()
+        self.inserted = {}
+        self.failures = []
+
+    async def insert(self, collection: str, docs):
+
+        if not docs:
+            return
+
+        # Block generation once `concurrency` batches are in flight
+        await self.semaphore.acquire()
+
+        task = asyncio.create_task(self._insert(collection, docs))
+        self.pending.add(task)
+        task.add_done_callback(self.pending.discard)
+
+    async def _insert(self, collection: str, docs):
+        try:
+            await self.db[collection].insert_many(docs, ordered=False)
+            self.inserted[collection] = self.inserted.get(collection, 0) + len(docs)
+        except Exception as e:
+            # Finished tasks are dropped from `pending`, so keep the error here
+            self.failures.append((collection, len(docs), e))
+        finally:
+            self.semaphore.release()
+
+    async def drain(self):
+        if self.pending:
+            await asyncio.gather(*self.pending)
+
+
+async def generate(args):
+
+    rng = random.Random(args.seed)
+
+    now = (
+        datetime.fromisoformat(args.now)
+        if args.now
+        else datetime.utcnow().replace(minute=0, second=0, microsecond=0)
+    )
+
+    client = AsyncIOMotorClient(args.mongo_uri, maxPoolSize=args.concurrency * 2)
+    db = client[args.database]
+
+    if args.drop:
+        for name in ("creators", "groups", "plans", "orders", "subscriptions"):
+            await db.drop_collection(name)
+
+    loader = BatchLoader(db, args.concurrency)
+    started = time.monotonic()
+
+    creators, groups, plans, catalog = build_catalog(rng, args, now)
+
+    for collection, docs in (("creators", creators), ("groups", groups), ("plans", plans)):
+        for i in range(0, len(docs), args.batch_size):
+            await loader.insert(collection, docs[i:i + args.batch_size])
+
+    creator_weights = zipf_cum_weights(len(catalog), args.creator_skew)
+    user_weights = zipf_cum_weights(args.users, args.user_skew)
+
+    cluster_days = [
+        rng.uniform(0, args.days_back)
+        for _ in range(args.cluster_points)
+    ]
+
+    remaining = args.subscriptions
+
+    while remaining > 0:
+
+        size = min(args.batch_size, remaining)
+
+        orders, subscriptions = build_subscription_batch(
+            rng, args, now, catalog, creator_weights, user_weights, cluster_days, size
+        )
+
+        await loader.insert("orders", orders)
+        await loader.insert("subscriptions", subscriptions)
+
+        remaining -= size
+
+        done = args.subscriptions - remaining
+        print(f"Generated {done}/{args.subscriptions} subscriptions")
+
+    await loader.drain()
+
+    elapsed = time.monotonic() - started
+
+    for collection, count in sorted(loader.inserted.items()):
+        print(f"{collection}: {count}")
+
+    client.close()
+
+    if loader.failures:
+
+        for collection, count, error in loader.failures:
+            print(f"Failed batch of {count} {collection}: {error}")
+
+        raise SystemExit(f"{len(loader.failures)} batches failed; dataset is incomplete")
+
+    print(f"Loaded in {elapsed:.1f}s")
+
+
+def parse_args(argv=None):
+
+    parser = argparse.ArgumentParser(
+        description="Generate a synthetic subscription dataset into MongoDB"
+    )
+
+    parser.add_argument("--mongo-uri", default="mongodb://localhost:27017")
+    parser.add_argument("--database", default="subscription_loadtest")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--now", help="Anchor time (ISO 8601, UTC); defaults to the current hour")
+
+    parser.add_argument("--creators", type=int, default=2000)
+    parser.add_argument("--users", type=int, default=500000)
+    parser.add_argument("--subscriptions", type=int, default=1000000)
+    parser.add_argument("--max-groups", type=int, default=3)
+    parser.add_argument("--max-plans", type=int, default=4)
+
+    parser.add_argument("--creator-skew", type=float, default=1.2, help="Zipf exponent for creator popularity")
+    parser.add_argument("--user-skew", type=float, default=0.8, help="Zipf exponent for repeat buyers")
+    parser.add_argument("--days-back", type=int, default=365)
+    parser.add_argument("--expiry-cluster", type=float, default=0.3, help="Share of purchases made on campaign days")
+    parser.add_argument("--cluster-points", type=int, default=12)
+    parser.add_argument("--stale-fraction", type=float, default=0.01, help="Share of expired subscriptions left active")
+    parser.add_argument("--pending-ratio", type=float, default=0.2, help="Abandoned orders per subscription")
+
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--drop", action="store_true", help="Drop the target collections first")
+
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    asyncio.run(generate(parse_args(argv)))
+
+
+if __name__ == "__main__":
+    main()
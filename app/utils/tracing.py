@@ -0,0 +1,183 @@
+import contextvars
+import json
+import random
+import time
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+from urllib.parse import urlsplit
+
+from pymongo import monitoring
+from telegram.request import HTTPXRequest
+
+from app.config import settings
+
+
+MAX_SPANS = 200
+
+current_trace = contextvars.ContextVar("current_trace", default=None)
+
+# Last N slow requests, newest last
+slow_requests = deque(maxlen=settings.TRACE_BUFFER_SIZE)
+
+
+class Trace:
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.spans = []
+        self.totals = {}
+        self.counts = {}
+        self.dropped = 0
+        self.mongo_pending = {}
+
+    def add_span(self, kind: str, name: str, started: float, duration_ms: float, error=None):
+
+        self.totals[kind] = self.totals.get(kind, 0.0) + duration_ms
+        self.counts[kind] = self.counts.get(kind, 0) + 1
+
+        # Totals stay exact; only the per-span detail is capped
+        if len(self.spans) >= MAX_SPANS:
+            self.dropped += 1
+            return
+
+        span = {
+            "kind": kind,
+            "name": name,
+            "start_ms": round((started - self.started) * 1000, 2),
+            "duration_ms": round(duration_ms, 2)
+        }
+
+        if error:
+            span["error"] = error
+
+        self.spans.append(span)
+
+
+@contextmanager
+def span(kind: str, name: str):
+
+    trace = current_trace.get()
+
+    if trace is None:
+        yield
+        return
+
+    started = time.perf_counter()
+    error = None
+
+    try:
+        yield
+    except Exception as e:
+        error = type(e).__name__
+        raise
+    finally:
+        trace.add_span(kind, name, started, (time.perf_counter() - started) * 1000, error)
+
+
+def start_trace():
+
+    if random.random() >= settings.TRACE_SAMPLE_RATE:
+        return None
+
+    trace = Trace()
+    current_trace.set(trace)
+
+    return trace
+
+
+def finish_request(trace, method: str, path: str, status: int, duration_ms: float):
+
+    if duration_ms < settings.TRACE_SLOW_MS:
+        return
+
+    summary = {
+        "at": datetime.utcnow().isoformat(),
+        "method": method,
+        "path": path,
+        "status": status,
+        "duration_ms": round(duration_ms, 2),
+        "sampled": trace is not None
+    }
+
+    if trace is not None:
+        summary["breakdown_ms"] = {k: round(v, 2) for k, v in trace.totals.items()}
+        summary["counts"] = trace.counts
+        summary["spans"] = trace.spans
+        summary["dropped_spans"] = trace.dropped
+
+    slow_requests.append(summary)
+
+    print("Slow request:", json.dumps(summary))
+
+
+# =========================================================
+# MONGO COMMANDS
+# =========================================================
+class MongoCommandTracer(monitoring.CommandListener):
+
+    # Motor runs commands on executor threads with the caller's context copied
+
+    def started(self, event):
+
+        trace = current_trace.get()
+
+        if trace is None:
+            return
+
+        target = event.command.get(event.command_name)
+        name = event.command_name
+
+        if isinstance(target, str):
+            name = f"{name} {target}"
+
+        trace.mongo_pending[event.request_id] = (name, time.perf_counter())
+
+    def succeeded(self, event):
+        self._finish(event)
+
+    def failed(self, event):
+        self._finish(event, error=event.failure.get("codeName", "failed"))
+
+    def _finish(self, event, error=None):
+
+        trace = current_trace.get()
+
+        if trace is None:
+            return
+
+        pending = trace.mongo_pending.pop(event.request_id, None)
+
+        if pending is None:
+            return
+
+        name, started = pending
+
+        trace.add_span("mongo", name, started, event.duration_micros / 1000, error)
+
+
+# =========================================================
+# OUTBOUND HTTP
+# =========================================================
+class TracedHTTPXRequest(HTTPXRequest):
+
+    async def do_request(self, url, method, *args, **kwargs):
+
+        # Last path segment is the Bot API method; the token stays out of the trace
+        with span("http", f"telegram {url.rsplit('/', 1)[-1]}"):
+            return await super().do_request(url, method, *args, **kwargs)
+
+
+def trace_requests_response(response, *args, **kwargs):
+
+    # requests hook for sync clients such as razorpay
+    trace = current_trace.get()
+
+    if trace is None:
+        return
+
+    duration_ms = response.elapsed.total_seconds() * 1000
+    started = time.perf_counter() - duration_ms / 1000
+    url = urlsplit(response.request.url)
+
+    trace.add_span("http", f"{response.request.method} {url.netloc}{url.path}", started, duration_ms)